@@ -1,9 +1,20 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for, flash, send_from_directory
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, flash, send_from_directory, g, abort
+from werkzeug.security import check_password_hash, safe_join
 from werkzeug.utils import secure_filename
+from flask_caching import Cache
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+import hashlib
+import mimetypes
 import sqlite3
+import sys
+import tempfile
+import threading
 import os
 from datetime import datetime
+from urllib.parse import quote, unquote
 import json
 
 app = Flask(__name__)
@@ -11,10 +22,81 @@ app.secret_key = os.environ.get('SECRET_KEY', os.urandom(24))
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 
+# Let the front-end web server send upload bytes instead of the Python worker:
+# USE_X_SENDFILE=1 for Apache (mod_xsendfile) or lighttpd, X_ACCEL_REDIRECT_PREFIX
+# for an nginx internal location aliased to the upload folder. Both stay off by
+# default because Waitress on its own cannot act on these headers.
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE') == '1'
+app.config['X_ACCEL_REDIRECT_PREFIX'] = os.environ.get('X_ACCEL_REDIRECT_PREFIX', '')
+
+cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache', 'CACHE_DEFAULT_TIMEOUT': 300})
+
+password_hasher = PasswordHasher()
+HASH_POOL = ThreadPoolExecutor(max_workers=os.cpu_count())
+
 # Ensure upload directory exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
-ALLOWED_EXTENSIONS = {'txt', 'pdf', 'png', 'jpg', 'jpeg', 'gif', 'mp4', 'avi', 'mov', 'wmv'}
+ALLOWED_EXTENSIONS = frozenset({'txt', 'pdf', 'png', 'jpg', 'jpeg', 'gif', 'mp4', 'avi', 'mov', 'wmv'})
+_ALLOWED_SUFFIXES = tuple('.' + ext for ext in ALLOWED_EXTENSIONS)
+DATABASE = 'catalog.db'
+UPLOAD_FIELDS = ('image', 'pdf', 'video')
+STREAM_CHUNK_SIZE = 1024 * 1024  # 1MB reads when streaming uploads to disk
+UPLOAD_MAX_AGE = 365 * 24 * 60 * 60  # Uploads are content-addressed, so safe to cache for a year
+
+# Mode a plain open() would give new files (0644 under the usual umask). Temp
+# files are created 0600, which would hide uploads from an nginx or Apache
+# user serving them via X-Accel-Redirect or X-Sendfile. Read once at import,
+# as os.umask() can only be read by setting it.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+UPLOAD_FILE_MODE = 0o666 & ~_UMASK
+
+# Per-connection tuning; journal_mode=WAL is persistent and set once in init_db()
+CONNECTION_PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA cache_size=-20000',
+    'PRAGMA foreign_keys=ON',
+)
+
+STARRED_PRODUCTS_SCHEMA = '''CREATE TABLE IF NOT EXISTS starred_products (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        product_id INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+        FOREIGN KEY (product_id) REFERENCES products (id) ON DELETE CASCADE,
+        UNIQUE(user_id, product_id)
+    )'''
+
+# Statements run on the request path. sqlite3 caches prepared statements per
+# connection keyed by SQL text, so every caller shares one literal
+STATEMENT_CACHE_SIZE = 256
+Q_PRODUCTS_VERSION = 'SELECT COUNT(*), MAX(id) FROM products'
+Q_CATALOG = '''SELECT id, name, description, category, price, image_url, pdf_url, video_url
+               FROM products ORDER BY created_at DESC'''
+Q_ADMIN_CATALOG = '''SELECT id, name, description, category, price, image_url, pdf_url, video_url, created_at
+                     FROM products ORDER BY created_at DESC'''
+Q_LOGIN = 'SELECT id, password, is_admin FROM users WHERE email = ?'
+Q_USER_BY_EMAIL = 'SELECT id FROM users WHERE email = ?'
+Q_INSERT_USER = 'INSERT INTO users (email, password) VALUES (?, ?)'
+Q_REHASH_USER = 'UPDATE users SET password = ? WHERE id = ?'
+Q_STARRED_IDS = 'SELECT product_id FROM starred_products WHERE user_id = ?'
+Q_USER_STARRED = '''SELECT p.id, p.name, p.description, p.category, p.price, p.image_url, p.pdf_url, p.video_url
+                    FROM products p
+                    JOIN starred_products sp ON p.id = sp.product_id 
+                    WHERE sp.user_id = ? ORDER BY sp.created_at DESC'''
+Q_PRODUCT = 'SELECT * FROM products WHERE id = ?'
+Q_IS_STARRED = 'SELECT id FROM starred_products WHERE user_id = ? AND product_id = ?'
+Q_INSERT_PRODUCT = '''INSERT INTO products (name, description, category, price, image_url, pdf_url, video_url) 
+                      VALUES (?, ?, ?, ?, ?, ?, ?)'''
+Q_PRODUCT_FILES = 'SELECT image_url, pdf_url, video_url FROM products WHERE id = ?'
+Q_DELETE_PRODUCT = 'DELETE FROM products WHERE id = ?'
+Q_FILE_IN_USE = 'SELECT 1 FROM products WHERE ? IN (image_url, pdf_url, video_url) LIMIT 1'
+Q_STAR = 'INSERT OR IGNORE INTO starred_products (user_id, product_id) VALUES (?, ?)'
+Q_UNSTAR = 'DELETE FROM starred_products WHERE user_id = ? AND product_id = ?'
 
 def allowed_file(filename):
     """Check if uploaded file has an allowed extension.
@@ -25,11 +107,169 @@ def allowed_file(filename):
     Returns:
         bool: True if file extension is allowed, False otherwise
     """
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return bool(filename) and filename.lower().endswith(_ALLOWED_SUFFIXES)
+
+def run_off_request_thread(func, *args):
+    """Run CPU-bound work such as password hashing on a native worker thread.
+    
+    Under gevent the calling greenlet yields to other requests until the
+    hub's thread pool finishes; otherwise the work runs on HASH_POOL, which
+    also caps concurrent hashes at the CPU count.
+    
+    Args:
+        func (callable): Function to run
+        *args: Positional arguments for func
+        
+    Returns:
+        The return value of func
+    """
+    monkey = sys.modules.get('gevent.monkey')
+    if monkey is not None and monkey.is_module_patched('threading'):
+        import gevent
+        return gevent.get_hub().threadpool.spawn(func, *args).get()
+    return HASH_POOL.submit(func, *args).result()
+
+def hash_password(password):
+    """Hash a password with argon2id for storage in users.password."""
+    return run_off_request_thread(password_hasher.hash, password)
+
+def verify_password(stored_hash, password):
+    """Check a password against a stored argon2 or legacy Werkzeug hash.
+    
+    The check itself runs through run_off_request_thread().
+    
+    Args:
+        stored_hash (str): Value of users.password
+        password (str): Plain-text password from the login form
+        
+    Returns:
+        tuple: (matches, needs_rehash) where needs_rehash is True when a
+        matching hash is a legacy pbkdf2 hash or uses outdated argon2 parameters
+    """
+    return run_off_request_thread(_verify_password, stored_hash, password)
+
+def _verify_password(stored_hash, password):
+    """Blocking implementation of verify_password()."""
+    if stored_hash.startswith('$argon2'):
+        try:
+            password_hasher.verify(stored_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False, False
+        return True, password_hasher.check_needs_rehash(stored_hash)
+    
+    matches = check_password_hash(stored_hash, password)
+    return matches, matches
+
+def get_db():
+    """Return the database connection for the current request.
+    
+    The connection is opened on first use and reused for the rest of the
+    request, then closed by close_db() when the app context is torn down.
+    
+    Returns:
+        sqlite3.Connection: Connection with sqlite3.Row as row factory
+    """
+    if 'db' not in g:
+        g.db = sqlite3.connect(DATABASE, check_same_thread=False,
+                               cached_statements=STATEMENT_CACHE_SIZE)
+        g.db.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            g.db.execute(pragma)
+    return g.db
+
+def os_thread_local():
+    """Return a threading.local that is per OS thread, even under gevent.
+    
+    gevent's patched threading.local is per greenlet, which would give every
+    request its own connection. Greenlets sharing a hub thread never run a
+    sqlite3 call at the same moment, so they can share one.
+    """
+    monkey = sys.modules.get('gevent.monkey')
+    if monkey is not None and monkey.is_module_patched('threading'):
+        return monkey.get_original('threading', 'local')()
+    return threading.local()
+
+_read_only = os_thread_local()
+
+def get_read_only_db():
+    """Return this thread's long-lived read-only connection for catalog reads.
+    
+    Unlike get_db(), the connection is kept open across requests so the
+    index and admin catalog queries skip the connect and reuse SQLite's page
+    cache and prepared-statement cache. WAL mode lets it read while other
+    connections write.
+    
+    Returns:
+        sqlite3.Connection: Read-only connection with sqlite3.Row as row factory
+    """
+    conn = getattr(_read_only, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(f'file:{DATABASE}?mode=ro', uri=True,
+                               cached_statements=STATEMENT_CACHE_SIZE)
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        _read_only.conn = conn
+    return conn
+
+@app.teardown_appcontext
+def close_db(exception):
+    """Close the request's database connection if one was opened."""
+    db = g.pop('db', None)
+    if db is not None:
+        db.close()
+
+def products_version():
+    """Return a token that changes whenever a product is added or deleted.
+    
+    Products are never edited in place and AUTOINCREMENT ids are never reused,
+    so (row count, highest id) identifies the catalog contents. Reading it from
+    the database keeps the cache correct across every worker process.
+    
+    Returns:
+        tuple: (product count, highest product id)
+    """
+    return tuple(get_read_only_db().execute(Q_PRODUCTS_VERSION).fetchone())
+
+@cache.memoize()
+def get_catalog(version):
+    """Return all products, newest first, cached per catalog version.
+    
+    Args:
+        version (tuple): Current products_version(), used only as the cache key
+        
+    Returns:
+        list: Product dicts with the columns rendered on the catalog grid
+    """
+    c = get_read_only_db().cursor()
+    c.execute(Q_CATALOG)
+    return [dict(row) for row in c.fetchall()]
+
+@cache.memoize()
+def admin_catalog_json(version):
+    """Return the admin product list serialized to JSON, cached per catalog version.
+    
+    Args:
+        version (tuple): Current products_version(), used only as the cache key
+        
+    Returns:
+        str: JSON array of products with precomputed file and delete URLs
+    """
+    c = get_read_only_db().cursor()
+    c.execute(Q_ADMIN_CATALOG)
+    
+    products = []
+    for row in c.fetchall():
+        product = dict(row)
+        product['image_src'] = url_for('uploaded_file', filename=row['image_url']) if row['image_url'] else ''
+        product['delete_url'] = url_for('delete_product', product_id=row['id'])
+        products.append(product)
+    return json.dumps(products)
 
 def init_db():
     """Initialize the database with required tables."""
-    conn = sqlite3.connect('catalog.db')
+    conn = sqlite3.connect(DATABASE)
+    conn.execute('PRAGMA journal_mode=WAL')
     c = conn.cursor()
     
     # Users table
@@ -55,22 +295,34 @@ def init_db():
         updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     )''')
     
-    # Starred products table
-    c.execute('''CREATE TABLE IF NOT EXISTS starred_products (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id INTEGER,
-        product_id INTEGER,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (user_id) REFERENCES users (id),
-        FOREIGN KEY (product_id) REFERENCES products (id),
-        UNIQUE(user_id, product_id)
-    )''')
+    # Starred products table; databases created before deletes cascaded are
+    # rebuilt in one transaction, dropping stars whose product no longer exists
+    c.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'starred_products'")
+    existing = c.fetchone()
+    if existing and 'ON DELETE CASCADE' not in existing[0]:
+        conn.executescript(f'''
+            BEGIN;
+            ALTER TABLE starred_products RENAME TO starred_products_old;
+            {STARRED_PRODUCTS_SCHEMA};
+            INSERT INTO starred_products (id, user_id, product_id, created_at)
+                SELECT id, user_id, product_id, created_at FROM starred_products_old
+                WHERE product_id IN (SELECT id FROM products);
+            DROP TABLE starred_products_old;
+            COMMIT;
+        ''')
+    else:
+        c.execute(STARRED_PRODUCTS_SCHEMA)
+    
+    # Indexes for hot lookups; users.email and starred_products(user_id, product_id)
+    # are already covered by the automatic indexes behind their UNIQUE constraints
+    c.execute('CREATE INDEX IF NOT EXISTS idx_products_created ON products (created_at DESC)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_starred_user_created ON starred_products (user_id, created_at DESC)')
     
     # Create admin user if not exists
     admin_email = 'admin@rexinehouse.com'
-    c.execute('SELECT id FROM users WHERE email = ?', (admin_email,))
+    c.execute(Q_USER_BY_EMAIL, (admin_email,))
     if not c.fetchone():
-        admin_password = generate_password_hash('admin123')
+        admin_password = hash_password('admin123')
         c.execute('INSERT INTO users (email, password, is_admin) VALUES (?, ?, 1)', 
                  (admin_email, admin_password))
     
@@ -81,18 +333,16 @@ def init_db():
 @app.route('/')
 def index():
     """Display the home page with product catalog."""
-    conn = sqlite3.connect('catalog.db')
-    c = conn.cursor()
-    c.execute('SELECT * FROM products ORDER BY created_at DESC')
-    products = c.fetchall()
+    products = get_catalog(products_version())
     
-    # Get starred products if user is logged in
-    starred_products = []
+    # Get starred products if user is logged in; a set keeps the template's
+    # per-card membership test O(1)
+    starred_products = frozenset()
     if 'user_id' in session:
-        c.execute('SELECT product_id FROM starred_products WHERE user_id = ?', (session['user_id'],))
-        starred_products = [row[0] for row in c.fetchall()]
+        c = get_db().cursor()
+        c.execute(Q_STARRED_IDS, (session['user_id'],))
+        starred_products = frozenset(row[0] for row in c.fetchall())
     
-    conn.close()
     return render_template('index.html', products=products, starred_products=starred_products)
 
 @app.route('/login', methods=['GET', 'POST'])
@@ -102,13 +352,17 @@ def login():
         email = request.form['email']
         password = request.form['password']
         
-        conn = sqlite3.connect('catalog.db')
+        conn = get_db()
         c = conn.cursor()
-        c.execute('SELECT id, password, is_admin FROM users WHERE email = ?', (email,))
+        c.execute(Q_LOGIN, (email,))
         user = c.fetchone()
-        conn.close()
         
-        if user and check_password_hash(user[1], password):
+        matches, needs_rehash = verify_password(user[1], password) if user else (False, False)
+        if matches:
+            if needs_rehash:
+                c.execute(Q_REHASH_USER, (hash_password(password), user[0]))
+                conn.commit()
+            
             session['user_id'] = user[0]
             session['email'] = email
             session['is_admin'] = bool(user[2])
@@ -130,21 +384,19 @@ def register():
         email = request.form['email']
         password = request.form['password']
         
-        conn = sqlite3.connect('catalog.db')
+        conn = get_db()
         c = conn.cursor()
         
         # Check if user already exists
-        c.execute('SELECT id FROM users WHERE email = ?', (email,))
+        c.execute(Q_USER_BY_EMAIL, (email,))
         if c.fetchone():
             flash('Email already registered!', 'error')
-            conn.close()
             return render_template('register.html')
         
         # Create new user
-        hashed_password = generate_password_hash(password)
-        c.execute('INSERT INTO users (email, password) VALUES (?, ?)', (email, hashed_password))
+        hashed_password = hash_password(password)
+        c.execute(Q_INSERT_USER, (email, hashed_password))
         conn.commit()
-        conn.close()
         
         flash('Registration successful! Please login.', 'success')
         return redirect(url_for('login'))
@@ -165,13 +417,20 @@ def admin_dashboard():
         flash('Admin access required!', 'error')
         return redirect(url_for('login'))
     
-    conn = sqlite3.connect('catalog.db')
-    c = conn.cursor()
-    c.execute('SELECT * FROM products ORDER BY created_at DESC')
-    products = c.fetchall()
-    conn.close()
+    # The products table is filled in by main.js from api_products()
+    return render_template('admin_dashboard.html')
+
+@app.route('/api/products')
+def api_products():
+    """Return the admin product list as JSON for the dashboard table.
     
-    return render_template('admin_dashboard.html', products=products)
+    Returns:
+        JSON: List of products with file and delete URLs, newest first
+    """
+    if not session.get('is_admin'):
+        return jsonify({'success': False, 'message': 'Admin access required'})
+    
+    return app.response_class(admin_catalog_json(products_version()), mimetype='application/json')
 
 @app.route('/user/dashboard')
 def user_dashboard():
@@ -180,33 +439,127 @@ def user_dashboard():
         flash('User access required!', 'error')
         return redirect(url_for('login'))
     
-    conn = sqlite3.connect('catalog.db')
-    c = conn.cursor()
-    c.execute('''SELECT p.* FROM products p 
-                 JOIN starred_products sp ON p.id = sp.product_id 
-                 WHERE sp.user_id = ? ORDER BY sp.created_at DESC''', (session['user_id'],))
+    c = get_db().cursor()
+    c.execute(Q_USER_STARRED, (session['user_id'],))
     starred_products = c.fetchall()
-    conn.close()
     
     return render_template('user_dashboard.html', starred_products=starred_products)
 
+@app.route('/product/<int:product_id>')
+def product_detail(product_id):
+    """Display a single product with all of its details.
+    
+    Args:
+        product_id (int): ID of the product to show
+    
+    Returns:
+        HTML: Rendered product template, or redirect to home if not found
+    """
+    c = get_db().cursor()
+    c.execute(Q_PRODUCT, (product_id,))
+    product = c.fetchone()
+    
+    if not product:
+        flash('Product not found!', 'error')
+        return redirect(url_for('index'))
+    
+    starred = False
+    if 'user_id' in session:
+        c.execute(Q_IS_STARRED, (session['user_id'], product_id))
+        starred = c.fetchone() is not None
+    
+    return render_template('product.html', product=product, starred=starred)
+
 def handle_file_upload(file_key):
     """Handle individual file upload and return filename.
     
+    Files already sent through upload_stream arrive as a '<file_key>_token'
+    form field holding the stored filename; otherwise the multipart file
+    in request.files is saved.
+    
     Args:
         file_key (str): Key for the file in request.files
         
     Returns:
         str: Filename if uploaded successfully, empty string otherwise
     """
+    token = secure_filename(request.form.get(f'{file_key}_token', ''))
+    if token:
+        if allowed_file(token) and os.path.isfile(os.path.join(app.config['UPLOAD_FOLDER'], token)):
+            return token
+        return ''
+    
     if file_key in request.files and request.files[file_key].filename != '':
         file = request.files[file_key]
         if allowed_file(file.filename):
-            filename = secure_filename(file.filename)
-            file.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
-            return filename
+            return store_upload(file.stream, file.filename)
     return ''
 
+def store_upload(stream, original_name):
+    """Save an uploaded file under the SHA-256 of its contents.
+    
+    The stream is hashed while it is copied to a temporary file in the upload
+    folder, which is then renamed to '<hexdigest>.<ext>'. Identical uploads
+    share one file, and a stored file never changes once its name is known.
+    
+    Args:
+        stream: Binary file-like object to read from
+        original_name (str): Client filename, used only for its extension
+        
+    Returns:
+        str: Stored filename
+    """
+    folder = app.config['UPLOAD_FOLDER']
+    ext = original_name.rsplit('.', 1)[1].lower()
+    hasher = hashlib.sha256()
+    
+    with tempfile.NamedTemporaryFile(dir=folder, delete=False) as tmp:
+        try:
+            for chunk in iter(lambda: stream.read(STREAM_CHUNK_SIZE), b''):
+                hasher.update(chunk)
+                tmp.write(chunk)
+        except Exception:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+    
+    filename = f'{hasher.hexdigest()}.{ext}'
+    target = os.path.join(folder, filename)
+    if os.path.exists(target):
+        os.unlink(tmp.name)  # Already stored by an earlier identical upload
+    else:
+        os.chmod(tmp.name, UPLOAD_FILE_MODE)
+        os.replace(tmp.name, target)
+    return filename
+
+@app.route('/admin/upload_stream/<field>', methods=['PUT'])
+def upload_stream(field):
+    """Stream a raw file body straight to the upload folder.
+    
+    The original filename is sent percent-encoded in the X-Filename header,
+    as header values cannot carry non-Latin-1 names. Only its extension is
+    kept, so it is checked as sent, like handle_file_upload(). Reading
+    request.stream avoids multipart parsing, so large videos are hashed and copied
+    to disk in STREAM_CHUNK_SIZE pieces.
+    
+    Args:
+        field (str): Product file field the upload belongs to
+        
+    Returns:
+        JSON: Success status and the stored filename to submit as a token
+    """
+    if not session.get('is_admin'):
+        return jsonify({'success': False, 'message': 'Admin access required'})
+    
+    if field not in UPLOAD_FIELDS:
+        return jsonify({'success': False, 'message': 'Unknown upload field'})
+    
+    filename = unquote(request.headers.get('X-Filename', ''))
+    if not allowed_file(filename):
+        return jsonify({'success': False, 'message': 'File type not allowed'})
+    
+    return jsonify({'success': True, 'filename': store_upload(request.stream, filename)})
+
 @app.route('/admin/add_product', methods=['POST'])
 def add_product():
     """Add new product to the catalog."""
@@ -217,7 +570,7 @@ def add_product():
     name = request.form['name']
     description = request.form['description']
     category = request.form['category']
-    price = float(request.form['price']) if request.form['price'] else 0.0
+    price = float(request.form.get('price') or 0)
     
     # Handle file uploads
     image_url = handle_file_upload('image')
@@ -225,13 +578,10 @@ def add_product():
     video_url = handle_file_upload('video')
     
     # Save to database
-    conn = sqlite3.connect('catalog.db')
+    conn = get_db()
     c = conn.cursor()
-    c.execute('''INSERT INTO products (name, description, category, price, image_url, pdf_url, video_url) 
-                 VALUES (?, ?, ?, ?, ?, ?, ?)''', 
-              (name, description, category, price, image_url, pdf_url, video_url))
+    c.execute(Q_INSERT_PRODUCT, (name, description, category, price, image_url, pdf_url, video_url))
     conn.commit()
-    conn.close()
     
     flash('Product added successfully!', 'success')
     return redirect(url_for('admin_dashboard'))
@@ -250,30 +600,31 @@ def delete_product(product_id):
         flash('Admin access required!', 'error')
         return redirect(url_for('login'))
     
-    conn = sqlite3.connect('catalog.db')
+    conn = get_db()
     c = conn.cursor()
     
     # Get file URLs to delete files
-    c.execute('SELECT image_url, pdf_url, video_url FROM products WHERE id = ?', (product_id,))
+    c.execute(Q_PRODUCT_FILES, (product_id,))
     product = c.fetchone()
     
     if product:
-        # Delete files
+        # Starred entries are removed by ON DELETE CASCADE in the same transaction
+        with conn:
+            conn.execute(Q_DELETE_PRODUCT, (product_id,))
+        
+        # Delete files no other product still uses (identical uploads share a file);
+        # unlink directly rather than stat first
         for file_url in product:
             if file_url:
-                file_path = os.path.join(app.config['UPLOAD_FOLDER'], file_url)
-                if os.path.exists(file_path):
-                    os.remove(file_path)
+                if c.execute(Q_FILE_IN_USE, (file_url,)).fetchone():
+                    continue
+                with suppress(FileNotFoundError):
+                    os.unlink(os.path.join(app.config['UPLOAD_FOLDER'], file_url))
         
-        # Delete product and related starred entries
-        c.execute('DELETE FROM starred_products WHERE product_id = ?', (product_id,))
-        c.execute('DELETE FROM products WHERE id = ?', (product_id,))
-        conn.commit()
         flash('Product deleted successfully!', 'success')
     else:
         flash('Product not found!', 'error')
     
-    conn.close()
     return redirect(url_for('admin_dashboard'))
 
 @app.route('/star_product/<int:product_id>')
@@ -289,26 +640,22 @@ def star_product(product_id):
     if 'user_id' not in session:
         return jsonify({'success': False, 'message': 'Login required'})
     
-    conn = sqlite3.connect('catalog.db')
+    conn = get_db()
     c = conn.cursor()
     
-    # Check if already starred
-    c.execute('SELECT id FROM starred_products WHERE user_id = ? AND product_id = ?', 
-              (session['user_id'], product_id))
+    # Try to add the star; UNIQUE(user_id, product_id) makes this a no-op when
+    # it already exists, and the foreign key rejects products that no longer exist
+    try:
+        c.execute(Q_STAR, (session['user_id'], product_id))
+    except sqlite3.IntegrityError:
+        return jsonify({'success': False, 'message': 'Product not found'})
     
-    if c.fetchone():
-        # Remove star
-        c.execute('DELETE FROM starred_products WHERE user_id = ? AND product_id = ?', 
-                  (session['user_id'], product_id))
-        starred = False
-    else:
-        # Add star
-        c.execute('INSERT INTO starred_products (user_id, product_id) VALUES (?, ?)', 
-                  (session['user_id'], product_id))
-        starred = True
+    starred = c.rowcount == 1
+    if not starred:
+        # Already starred, so remove it
+        c.execute(Q_UNSTAR, (session['user_id'], product_id))
     
     conn.commit()
-    conn.close()
     
     return jsonify({'success': True, 'starred': starred})
 
@@ -322,7 +669,22 @@ def uploaded_file(filename):
     Returns:
         File: The requested file from uploads directory
     """
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    accel_prefix = app.config['X_ACCEL_REDIRECT_PREFIX']
+    if accel_prefix:
+        if safe_join(app.config['UPLOAD_FOLDER'], filename) is None:
+            abort(404)
+        response = app.response_class(mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+        response.headers['X-Accel-Redirect'] = accel_prefix.rstrip('/') + '/' + quote(filename)
+        response.cache_control.public = True
+        response.cache_control.max_age = UPLOAD_MAX_AGE
+    else:
+        # conditional=True answers If-None-Match/If-Modified-Since with a 304 from a stat()
+        response = send_from_directory(app.config['UPLOAD_FOLDER'], filename,
+                                       max_age=UPLOAD_MAX_AGE, conditional=True)
+    
+    # Stored files are never rewritten, so browsers need not revalidate them
+    response.cache_control.immutable = True
+    return response
 
 @app.route('/contact')
 def contact():
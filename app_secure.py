@@ -4,14 +4,19 @@ Secure Flask application with proper error handling and code quality standards.
 """
 
 import os
+import sys
 import logging
+import threading
 from datetime import datetime
 from contextlib import contextmanager
-from typing import Optional, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, FrozenSet, Tuple, Callable
 
 from flask import Flask, render_template, request, jsonify, session, redirect, url_for, flash, send_from_directory
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
 from werkzeug.utils import secure_filename
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 import sqlite3
 
 # Configure logging
@@ -22,10 +27,22 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Security configurations
-ALLOWED_EXTENSIONS = {'txt', 'pdf', 'png', 'jpg', 'jpeg', 'gif', 'mp4', 'avi', 'mov', 'wmv'}
+ALLOWED_EXTENSIONS = frozenset({'txt', 'pdf', 'png', 'jpg', 'jpeg', 'gif', 'mp4', 'avi', 'mov', 'wmv'})
+_ALLOWED_SUFFIXES = tuple('.' + ext for ext in ALLOWED_EXTENSIONS)
 MAX_FILE_SIZE = 16 * 1024 * 1024  # 16MB
 DATABASE_PATH = 'catalog.db'
 UPLOAD_FOLDER = 'uploads'
+PASSWORD_HASHER = PasswordHasher()
+HASH_POOL = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+def _os_thread_local() -> threading.local:
+    """Per-OS-thread local storage; gevent's patched threading.local is per greenlet."""
+    monkey = sys.modules.get('gevent.monkey')
+    if monkey is not None and monkey.is_module_patched('threading'):
+        return monkey.get_original('threading', 'local')()
+    return threading.local()
+
+_READ_ONLY = _os_thread_local()
 
 def create_app() -> Flask:
     """Application factory pattern for better testability."""
@@ -55,6 +72,7 @@ class DatabaseManager:
         try:
             conn = sqlite3.connect(DATABASE_PATH)
             conn.row_factory = sqlite3.Row  # Enable column access by name
+            conn.execute('PRAGMA foreign_keys = ON')  # Enforce ON DELETE CASCADE
             yield conn
         except sqlite3.Error as e:
             logger.error(f"Database error: {e}")
@@ -65,6 +83,21 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
+    @staticmethod
+    def get_readonly_conn() -> sqlite3.Connection:
+        """Return this thread's long-lived read-only connection.
+        
+        Read paths reuse it instead of opening and closing a connection per
+        call; writes still go through get_db_connection(). Under gevent the
+        greenlets on a hub thread share it, as no sqlite3 call yields.
+        """
+        conn = getattr(_READ_ONLY, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(f'file:{DATABASE_PATH}?mode=ro', uri=True)
+            conn.row_factory = sqlite3.Row
+            _READ_ONLY.conn = conn
+        return conn
+    
     @staticmethod
     def init_database() -> None:
         """Initialize database with proper error handling."""
@@ -112,6 +145,15 @@ class DatabaseManager:
                     )
                 ''')
                 
+                # Indexes for catalog ordering and per-user favourites
+                cursor.execute(
+                    'CREATE INDEX IF NOT EXISTS idx_products_created ON products (created_at DESC)'
+                )
+                cursor.execute(
+                    'CREATE INDEX IF NOT EXISTS idx_starred_user_created '
+                    'ON starred_products (user_id, created_at DESC)'
+                )
+                
                 # Create admin user if not exists
                 DatabaseManager._create_admin_user(cursor)
                 conn.commit()
@@ -127,7 +169,7 @@ class DatabaseManager:
         admin_email = 'admin@rexinehouse.com'
         cursor.execute('SELECT id FROM users WHERE email = ?', (admin_email,))
         if not cursor.fetchone():
-            admin_password = generate_password_hash('admin123')
+            admin_password = SecurityUtils.hash_password('admin123')
             cursor.execute(
                 'INSERT INTO users (email, password, is_admin) VALUES (?, ?, 1)', 
                 (admin_email, admin_password)
@@ -140,9 +182,7 @@ class SecurityUtils:
     @staticmethod
     def is_allowed_file(filename: str) -> bool:
         """Check if file extension is allowed."""
-        if not filename:
-            return False
-        return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+        return bool(filename) and filename.lower().endswith(_ALLOWED_SUFFIXES)
     
     @staticmethod
     def validate_email(email: str) -> bool:
@@ -155,6 +195,40 @@ class SecurityUtils:
     def validate_password(password: str) -> bool:
         """Password strength validation."""
         return password and len(password) >= 6
+    
+    @staticmethod
+    def run_off_request_thread(func: Callable, *args: Any) -> Any:
+        """Run CPU-bound hashing on a native thread (gevent hub pool or HASH_POOL)."""
+        monkey = sys.modules.get('gevent.monkey')
+        if monkey is not None and monkey.is_module_patched('threading'):
+            import gevent
+            return gevent.get_hub().threadpool.spawn(func, *args).get()
+        return HASH_POOL.submit(func, *args).result()
+    
+    @staticmethod
+    def hash_password(password: str) -> str:
+        """Hash a password with argon2id."""
+        return SecurityUtils.run_off_request_thread(PASSWORD_HASHER.hash, password)
+    
+    @staticmethod
+    def verify_password(stored_hash: str, password: str) -> Tuple[bool, bool]:
+        """Verify an argon2 or legacy pbkdf2 hash; returns (matches, needs_rehash)."""
+        return SecurityUtils.run_off_request_thread(
+            SecurityUtils._verify_password, stored_hash, password
+        )
+    
+    @staticmethod
+    def _verify_password(stored_hash: str, password: str) -> Tuple[bool, bool]:
+        """Blocking implementation of verify_password."""
+        if stored_hash.startswith('$argon2'):
+            try:
+                PASSWORD_HASHER.verify(stored_hash, password)
+            except (VerificationError, InvalidHashError):
+                return False, False
+            return True, PASSWORD_HASHER.check_needs_rehash(stored_hash)
+        
+        matches = check_password_hash(stored_hash, password)
+        return matches, matches
 
 class UserService:
     """User-related business logic."""
@@ -170,8 +244,19 @@ class UserService:
                     (email,)
                 )
                 user = cursor.fetchone()
+                if not user:
+                    return None
                 
-                if user and check_password_hash(user['password'], password):
+                matches, needs_rehash = SecurityUtils.verify_password(user['password'], password)
+                if matches:
+                    if needs_rehash:
+                        cursor.execute(
+                            'UPDATE users SET password = ? WHERE id = ?',
+                            (SecurityUtils.hash_password(password), user['id'])
+                        )
+                        conn.commit()
+                        logger.info(f"Password hash upgraded for user {user['id']}")
+                    
                     return {
                         'id': user['id'],
                         'email': email,
@@ -194,7 +279,7 @@ class UserService:
             
             with DatabaseManager.get_db_connection() as conn:
                 cursor = conn.cursor()
-                hashed_password = generate_password_hash(password)
+                hashed_password = SecurityUtils.hash_password(password)
                 cursor.execute(
                     'INSERT INTO users (email, password) VALUES (?, ?)', 
                     (email, hashed_password)
@@ -217,28 +302,26 @@ class ProductService:
     def get_all_products() -> List[Dict[str, Any]]:
         """Get all products."""
         try:
-            with DatabaseManager.get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('SELECT * FROM products ORDER BY created_at DESC')
-                return [dict(row) for row in cursor.fetchall()]
+            rows = DatabaseManager.get_readonly_conn().execute(
+                'SELECT * FROM products ORDER BY created_at DESC'
+            ).fetchall()
+            return [dict(row) for row in rows]
         except sqlite3.Error as e:
             logger.error(f"Error fetching products: {e}")
             return []
     
     @staticmethod
-    def get_starred_products(user_id: int) -> List[int]:
-        """Get user's starred product IDs."""
+    def get_starred_products(user_id: int) -> FrozenSet[int]:
+        """Get user's starred product IDs as a set for O(1) membership tests."""
         try:
-            with DatabaseManager.get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    'SELECT product_id FROM starred_products WHERE user_id = ?', 
-                    (user_id,)
-                )
-                return [row['product_id'] for row in cursor.fetchall()]
+            rows = DatabaseManager.get_readonly_conn().execute(
+                'SELECT product_id FROM starred_products WHERE user_id = ?', 
+                (user_id,)
+            ).fetchall()
+            return frozenset(row['product_id'] for row in rows)
         except sqlite3.Error as e:
             logger.error(f"Error fetching starred products: {e}")
-            return []
+            return frozenset()
     
     @staticmethod
     def toggle_star_product(user_id: int, product_id: int) -> bool:
@@ -247,26 +330,19 @@ class ProductService:
             with DatabaseManager.get_db_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Check if already starred
+                # Add star; ignored when UNIQUE(user_id, product_id) already exists
                 cursor.execute(
-                    'SELECT id FROM starred_products WHERE user_id = ? AND product_id = ?', 
+                    'INSERT OR IGNORE INTO starred_products (user_id, product_id) VALUES (?, ?)', 
                     (user_id, product_id)
                 )
                 
-                if cursor.fetchone():
-                    # Remove star
+                starred = cursor.rowcount == 1
+                if not starred:
+                    # Already starred, so remove it
                     cursor.execute(
                         'DELETE FROM starred_products WHERE user_id = ? AND product_id = ?', 
                         (user_id, product_id)
                     )
-                    starred = False
-                else:
-                    # Add star
-                    cursor.execute(
-                        'INSERT INTO starred_products (user_id, product_id) VALUES (?, ?)', 
-                        (user_id, product_id)
-                    )
-                    starred = True
                 
                 conn.commit()
                 return starred
@@ -281,7 +357,7 @@ def index():
     """Home page with product catalog."""
     try:
         products = ProductService.get_all_products()
-        starred_products = []
+        starred_products = frozenset()
         
         if 'user_id' in session:
             starred_products = ProductService.get_starred_products(session['user_id'])
@@ -290,7 +366,7 @@ def index():
     except Exception as e:
         logger.error(f"Error in index route: {e}")
         flash('An error occurred while loading the catalog.', 'error')
-        return render_template('index.html', products=[], starred_products=[])
+        return render_template('index.html', products=[], starred_products=frozenset())
 
 @app.route('/login', methods=['GET', 'POST'])
 def login():
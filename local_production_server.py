@@ -5,9 +5,8 @@ Production-grade server for local testing and development
 """
 
 import os
-import sys
-from waitress import serve
-from app import app
+
+from production_server import serve_waitress, waitress_options, waitress_summary
 
 def main():
     """Run the application with Waitress on localhost"""
@@ -15,17 +14,24 @@ def main():
     # Set production environment
     os.environ['FLASK_ENV'] = 'production'
     
+    from app import app, init_db
+    
     # Disable debug mode for production
     app.debug = False
     
+    # Create or migrate the database schema before serving
+    init_db()
+    
     # Configure for local access
     host = '127.0.0.1'  # localhost only
     port = int(os.environ.get('PORT', 5000))
+    options = waitress_options()
     
     print("=" * 60)
     print("🚀 VINAYAK REXINE HOUSE - Local Production Server")
     print("=" * 60)
     print(f"📡 Server: Waitress WSGI Server (Production)")
+    print(waitress_summary(options))
     print(f"🌐 Host: {host} (localhost)")
     print(f"🔌 Port: {port}")
     print(f"🔗 Access URL: http://{host}:{port}")
@@ -36,23 +42,7 @@ def main():
     print("💡 Press Ctrl+C to stop the server")
     print("=" * 60)
     
-    try:
-        # Start Waitress server
-        serve(
-            app,
-            host=host,
-            port=port,
-            threads=4,  # Handle multiple requests simultaneously
-            connection_limit=100,  # Limit concurrent connections
-            cleanup_interval=30,  # Clean up connections regularly
-            channel_timeout=120,  # Timeout for slow clients
-            url_scheme='http'
-        )
-    except KeyboardInterrupt:
-        print("\n🛑 Server stopped by user")
-    except Exception as e:
-        print(f"❌ Server error: {e}")
-        sys.exit(1)
+    serve_waitress(app, host, port, options)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
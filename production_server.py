@@ -1,34 +1,130 @@
 #!/usr/bin/env python3
 """
 Production server for VINAYAK REXINE HOUSE Catalog System
-Uses Waitress WSGI server for production deployment
+Uses Gunicorn worker processes where available (Linux/macOS hosts),
+falling back to the Waitress WSGI server on Windows
 """
 
 import os
+import secrets
+import signal
 import sys
-from waitress import serve
-from app import app
+import importlib.util
+
+def gunicorn_available():
+    """Check whether Gunicorn can be used on this platform"""
+    return os.name != 'nt' and importlib.util.find_spec('gunicorn') is not None
+
+def gunicorn_worker_class():
+    """Return the Gunicorn worker class: GUNICORN_WORKER_CLASS, else gevent if installed, else gthread"""
+    default = 'gevent' if importlib.util.find_spec('gevent') is not None else 'gthread'
+    return os.environ.get('GUNICORN_WORKER_CLASS', default)
+
+def run_gunicorn(host, port, worker_class):
+    """Replace this process with Gunicorn.
+    
+    Worker processes run requests on every core instead of sharing one GIL.
+    Each gevent worker serves up to GUNICORN_WORKER_CONNECTIONS requests
+    concurrently, so slow uploads and downloads no longer hold a whole
+    worker; the gevent worker monkey-patches the standard library itself
+    before importing the app. gthread workers run GUNICORN_THREADS threads each.
+    """
+    cpus = os.cpu_count() or 1
+    workers = os.environ.get('GUNICORN_WORKERS', str(2 * cpus + 1))
+    
+    args = [
+        sys.executable, '-m', 'gunicorn',
+        '-k', worker_class,
+        '-w', workers,
+        '--timeout', '120',
+        '-b', f'{host}:{port}',
+        # Import app from beside this script, as the Waitress path does
+        '--pythonpath', os.path.dirname(os.path.abspath(__file__)),
+    ]
+    if worker_class == 'gevent':
+        args += ['--worker-connections', os.environ.get('GUNICORN_WORKER_CONNECTIONS', '1000')]
+    elif worker_class == 'gthread':
+        args += ['--threads', os.environ.get('GUNICORN_THREADS', '4')]
+    
+    os.execv(sys.executable, args + ['app:app'])
+
+def waitress_options():
+    """Return Waitress tuning from the environment.
+    
+    Idle keep-alive connections each hold a thread until channel_timeout, so
+    the defaults use more threads and a shorter timeout than Waitress's own.
+    """
+    cpus = os.cpu_count() or 1
+    return {
+        'threads': int(os.environ.get('WAITRESS_THREADS', max(8, 2 * cpus))),
+        'connection_limit': int(os.environ.get('WAITRESS_CONNECTION_LIMIT', 1000)),
+        'channel_timeout': int(os.environ.get('WAITRESS_CHANNEL_TIMEOUT', 30)),
+    }
+
+def waitress_summary(options):
+    """Return the startup banner line for waitress_options()"""
+    return (f"🧵 Threads: {options['threads']}, connection limit: {options['connection_limit']}, "
+            f"channel timeout: {options['channel_timeout']}s")
+
+def serve_waitress(app, host, port, options):
+    """Serve app with Waitress until Ctrl+C or SIGTERM"""
+    from waitress import serve
+    
+    # Exit cleanly when a service manager stops us; any other error propagates
+    # with its traceback so the supervisor can log it and restart the server
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    
+    try:
+        # Start Waitress server
+        serve(
+            app,
+            host=host,
+            port=port,
+            cleanup_interval=30,  # Clean up connections regularly
+            asyncore_use_poll=True,  # poll() has no select() limit on open sockets
+            url_scheme='http',
+            **options
+        )
+    except KeyboardInterrupt:
+        print("\n🛑 Server stopped by user")
 
 def main():
-    """Run the application with Waitress production server"""
+    """Run the application with Gunicorn, or Waitress where Gunicorn is unavailable"""
     
     # Set production environment
     os.environ['FLASK_ENV'] = 'production'
     
+    # Without SECRET_KEY every Gunicorn worker would pick its own random key
+    # and reject sessions signed by the others; pick one they all inherit
+    os.environ.setdefault('SECRET_KEY', secrets.token_hex(32))
+    
+    # Imported here so the module loads quickly; Gunicorn workers import app themselves
+    from app import app, init_db
+    
     # Disable debug mode for production
     app.debug = False
     
+    # Create or migrate the database schema before serving
+    init_db()
+    
     # Configure host and port
     host = os.environ.get('HOST', '0.0.0.0')
     port = int(os.environ.get('PORT', 5000))
     
     # Display URL - use localhost for local access
     display_url = f"http://localhost:{port}" if host == '0.0.0.0' else f"http://{host}:{port}"
+    use_gunicorn = gunicorn_available()
+    worker_class = gunicorn_worker_class() if use_gunicorn else None
+    options = waitress_options()
     
     print("=" * 60)
     print("🚀 VINAYAK REXINE HOUSE - Production Server Starting")
     print("=" * 60)
-    print(f"📡 Server: Waitress WSGI Server (Production)")
+    if use_gunicorn:
+        print(f"📡 Server: Gunicorn + {worker_class} workers (Production)")
+    else:
+        print(f"📡 Server: Waitress WSGI Server (Production)")
+        print(waitress_summary(options))
     print(f"🌐 Binding to: {host}:{port}")
     print(f"🔗 Access URL: {display_url}")
     print(f"🛡️ Security: Production Mode (Debug Disabled)")
@@ -37,23 +133,10 @@ def main():
     print("💡 Press Ctrl+C to stop the server")
     print("=" * 60)
     
-    try:
-        # Start Waitress server
-        serve(
-            app,
-            host=host,
-            port=port,
-            threads=4,  # Handle multiple requests simultaneously
-            connection_limit=100,  # Limit concurrent connections
-            cleanup_interval=30,  # Clean up connections regularly
-            channel_timeout=120,  # Timeout for slow clients
-            url_scheme='http'
-        )
-    except KeyboardInterrupt:
-        print("\n🛑 Server stopped by user")
-    except Exception as e:
-        print(f"❌ Server error: {e}")
-        sys.exit(1)
+    if use_gunicorn:
+        run_gunicorn(host, port, worker_class)
+    
+    serve_waitress(app, host, port, options)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -20,7 +20,9 @@ class SecurityConfig:
     # File Upload Security
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB
     UPLOAD_FOLDER = 'uploads'
-    ALLOWED_EXTENSIONS = {'txt', 'pdf', 'png', 'jpg', 'jpeg', 'gif', 'mp4', 'avi', 'mov', 'wmv'}
+    ALLOWED_EXTENSIONS = frozenset({'txt', 'pdf', 'png', 'jpg', 'jpeg', 'gif', 'mp4', 'avi', 'mov', 'wmv'})
+    # For filename.lower().endswith(ALLOWED_EXTENSIONS_DOTTED), which needs no split
+    ALLOWED_EXTENSIONS_DOTTED = tuple('.' + ext for ext in ALLOWED_EXTENSIONS)
     
     # Database Security
     DATABASE_URL = os.environ.get('DATABASE_URL') or 'catalog.db'
@@ -53,6 +55,12 @@ class SecurityConfig:
         'Referrer-Policy': 'strict-origin-when-cross-origin'
     }
     
+    # Serialized once here so response middleware only copies ready-made values:
+    # response.headers.update(SECURITY_HEADER_ITEMS) and
+    # response.headers['Content-Security-Policy'] = CSP_HEADER
+    CSP_HEADER = '; '.join(f'{name} {value}' for name, value in CSP_DIRECTIVES.items())
+    SECURITY_HEADER_ITEMS = tuple(SECURITY_HEADERS.items())
+    
     # Password Policy
     MIN_PASSWORD_LENGTH = 8
     REQUIRE_UPPERCASE = False
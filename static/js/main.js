@@ -155,7 +155,7 @@ document.addEventListener('DOMContentLoaded', function() {
         const value = field.value.trim();
         
         // Remove existing validation classes
-        field.classList.remove('is-valid', is-invalid');
+        field.classList.remove('is-valid', 'is-invalid');
         
         if (field.hasAttribute('required') && !value) {
             field.classList.add('is-invalid');
@@ -236,6 +236,185 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     });
     
+    // Streamed uploads for the admin product form: each file is PUT as a raw
+    // body and only the returned filename token goes in the form POST
+    const addProductForm = document.querySelector('#add-product-form');
+    if (addProductForm && window.fetch) {
+        addProductForm.addEventListener('submit', function(e) {
+            e.preventDefault();
+            
+            const form = this;
+            const uploadUrl = form.dataset.uploadUrl;
+            const fileFields = form.querySelectorAll('input[type="file"]');
+            
+            // Drop tokens left by an earlier attempt; the server reads the
+            // first <field>_token, so a stale one would win over this upload
+            form.querySelectorAll('input[type="hidden"][name$="_token"]')
+                .forEach(token => token.remove());
+            
+            const uploads = Array.from(fileFields)
+                .filter(input => input.files.length > 0)
+                .map(input => {
+                    const file = input.files[0];
+                    return fetch(uploadUrl + input.name, {
+                        method: 'PUT',
+                        headers: {
+                            // Header values must be Latin-1; app.py unquotes this
+                            'X-Filename': encodeURIComponent(file.name),
+                            'X-Requested-With': 'XMLHttpRequest',
+                        },
+                        body: file
+                    })
+                    .then(response => response.json())
+                    .then(data => {
+                        if (!data.success) {
+                            throw new Error(data.message || 'Upload failed');
+                        }
+                        
+                        const token = document.createElement('input');
+                        token.type = 'hidden';
+                        token.name = `${input.name}_token`;
+                        token.value = data.filename;
+                        form.appendChild(token);
+                        
+                        // Already on the server, so keep it out of the form POST
+                        input.disabled = true;
+                    });
+                });
+            
+            Promise.all(uploads)
+                .then(() => form.submit())
+                .catch(error => {
+                    fileFields.forEach(input => { input.disabled = false; });
+                    showToast(error.message || 'Upload failed. Please try again.', 'error');
+                });
+        });
+    }
+    
+    // Admin Products Table: rows come from the cached /api/products JSON
+    const adminProducts = document.querySelector('#admin-products');
+    if (adminProducts) {
+        fetch(adminProducts.dataset.apiUrl, {
+            headers: {
+                'X-Requested-With': 'XMLHttpRequest',
+            }
+        })
+        .then(response => response.json())
+        .then(products => {
+            if (!Array.isArray(products)) {
+                throw new Error(products.message || 'Could not load products');
+            }
+            
+            document.querySelector('#product-count').textContent = products.length;
+            if (products.length === 0) {
+                document.querySelector('#products-empty').classList.remove('d-none');
+                return;
+            }
+            
+            const tbody = adminProducts.querySelector('tbody');
+            products.forEach(product => tbody.appendChild(buildProductRow(product)));
+            document.querySelector('#products-table').classList.remove('d-none');
+        })
+        .catch(error => {
+            showToast(error.message || 'Could not load products', 'error');
+        });
+    }
+    
+    function createElement(tag, className, text) {
+        const element = document.createElement(tag);
+        if (className) {
+            element.className = className;
+        }
+        if (text !== undefined) {
+            element.textContent = text;
+        }
+        return element;
+    }
+    
+    function buildProductRow(product) {
+        const row = document.createElement('tr');
+        
+        // Image
+        const imageCell = createElement('td');
+        if (product.image_src) {
+            const img = createElement('img', 'img-thumbnail');
+            img.src = product.image_src;
+            img.alt = product.name;
+            img.style.cssText = 'width: 50px; height: 50px; object-fit: cover;';
+            imageCell.appendChild(img);
+        } else {
+            const placeholder = createElement('div', 'bg-light d-flex align-items-center justify-content-center');
+            placeholder.style.cssText = 'width: 50px; height: 50px;';
+            placeholder.appendChild(createElement('i', 'bi bi-image text-muted'));
+            imageCell.appendChild(placeholder);
+        }
+        row.appendChild(imageCell);
+        
+        // Name and description
+        const nameCell = createElement('td');
+        nameCell.appendChild(createElement('strong', '', product.name));
+        if (product.description) {
+            const description = product.description.length > 50
+                ? product.description.slice(0, 50) + '...'
+                : product.description;
+            nameCell.appendChild(document.createElement('br'));
+            nameCell.appendChild(createElement('small', 'text-muted', description));
+        }
+        row.appendChild(nameCell);
+        
+        // Category
+        const categoryCell = createElement('td');
+        categoryCell.appendChild(product.category
+            ? createElement('span', 'badge bg-secondary', product.category)
+            : createElement('span', 'text-muted', '-'));
+        row.appendChild(categoryCell);
+        
+        // Price
+        const priceCell = createElement('td');
+        priceCell.appendChild(product.price > 0
+            ? createElement('span', 'text-gold fw-bold', `₹${product.price.toFixed(2)}`)
+            : createElement('span', 'text-muted', '-'));
+        row.appendChild(priceCell);
+        
+        // Files
+        const filesCell = createElement('td');
+        const files = createElement('div', 'd-flex gap-1');
+        [
+            [product.image_url, 'bi bi-image text-primary', 'Image'],
+            [product.pdf_url, 'bi bi-file-earmark-pdf text-danger', 'PDF'],
+            [product.video_url, 'bi bi-play-circle text-success', 'Video']
+        ].forEach(([url, icon, title]) => {
+            if (url) {
+                const fileIcon = createElement('i', icon);
+                fileIcon.title = title;
+                files.appendChild(fileIcon);
+            }
+        });
+        filesCell.appendChild(files);
+        row.appendChild(filesCell);
+        
+        // Created
+        const createdCell = createElement('td');
+        createdCell.appendChild(createElement('small', 'text-muted',
+            product.created_at ? product.created_at.slice(0, 10) : '-'));
+        row.appendChild(createdCell);
+        
+        // Actions
+        const actionsCell = createElement('td');
+        const deleteLink = createElement('a', 'btn btn-danger btn-sm');
+        deleteLink.href = product.delete_url;
+        deleteLink.addEventListener('click', function(e) {
+            if (!confirm('Are you sure you want to delete this product?')) {
+                e.preventDefault();
+            }
+        });
+        deleteLink.appendChild(createElement('i', 'bi bi-trash'));
+        actionsCell.appendChild(deleteLink);
+        row.appendChild(actionsCell);
+        
+        return row;
+    }
+    
     // Smooth Scrolling for Anchor Links
     const anchorLinks = document.querySelectorAll('a[href^="#"]');
     anchorLinks.forEach(link => {